@@ -14,17 +14,20 @@
 # limitations under the License.
 
 import datetime
-import json
+import functools
 from zoneinfo import ZoneInfo
 
 from google.adk.agents import Agent
 from google.adk.apps.app import App
 from google.adk.models import Gemini
 from google.genai import types
+from pydantic import TypeAdapter
 
 from app.synth_data.codegen import generate_faker_python_script
 from app.synth_data.models import Schema
 
+_SCHEMA_ADAPTER = TypeAdapter(Schema)
+
 
 def get_weather(query: str) -> str:
     """Simulates a web search. Use it get information on weather.
@@ -73,9 +76,16 @@ def generate_synth_data_script(
     Returns:
         A Python script (as text) that generates CSV files in ./out.
     """
-    parsed = json.loads(schema_json)
-    schema = Schema.model_validate(parsed)
-    return generate_faker_python_script(schema=schema, rows_per_table=rows_per_table, seed=seed)
+    return _cached_synth_data_script(schema_json, rows_per_table, seed)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_synth_data_script(schema_json: str, rows_per_table: int, seed: int) -> str:
+    # Repeated agent turns with an unchanged schema skip validation and codegen.
+    schema = _SCHEMA_ADAPTER.validate_json(schema_json)
+    return generate_faker_python_script(
+        schema=schema, rows_per_table=rows_per_table, seed=seed
+    )
 
 
 root_agent = Agent(
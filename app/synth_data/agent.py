@@ -8,23 +8,33 @@ errors if `synth_data` is selected in the playground UI.
 Primary agent remains `app/agent.py`.
 """
 
-import json
+import functools
 
 from google.adk.agents import Agent
 from google.adk.models import Gemini
 from google.genai import types
+from pydantic import TypeAdapter
 
 from .codegen import generate_faker_python_script
 from .models import Schema
 
+_SCHEMA_ADAPTER = TypeAdapter(Schema)
+
 
 def generate_synth_data_script(
     schema_json: str, rows_per_table: int = 100, seed: int = 42
 ) -> str:
     """Generate an executable faker-based Python script from an inferred schema."""
-    parsed = json.loads(schema_json)
-    schema = Schema.model_validate(parsed)
-    return generate_faker_python_script(schema=schema, rows_per_table=rows_per_table, seed=seed)
+    return _cached_synth_data_script(schema_json, rows_per_table, seed)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_synth_data_script(schema_json: str, rows_per_table: int, seed: int) -> str:
+    # Repeated agent turns with an unchanged schema skip validation and codegen.
+    schema = _SCHEMA_ADAPTER.validate_json(schema_json)
+    return generate_faker_python_script(
+        schema=schema, rows_per_table=rows_per_table, seed=seed
+    )
 
 
 root_agent = Agent(
@@ -1,42 +1,203 @@
 from __future__ import annotations
 
+import functools
 import json
-from collections import defaultdict, deque
+import re
+
+from app.synth_data.models import Column, Schema, Table
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Column-name heuristics for picking a Faker provider. `re.match` tries the
+# alternatives in order, so earlier groups win exactly like an if/elif ladder.
+_PROVIDER_RE = re.compile(
+    r"(?P<uuid4>id\Z|.*_id\Z)"
+    r"|(?P<email>.*email)"
+    r"|(?P<first_name>(?:first_name|firstname)\Z)"
+    r"|(?P<last_name>(?:last_name|lastname|surname)\Z)"
+    r"|(?P<name>.*name)"
+    r"|(?P<company>.*(?:company|employer))"
+    r"|(?P<phone_number>.*(?:phone|mobile))"
+    r"|(?P<street_address>.*address)"
+    r"|(?P<city>.*city)"
+    r"|(?P<state>.*(?:state|province))"
+    r"|(?P<country>.*country)"
+    r"|(?P<postcode>.*(?:zip|postal))"
+    r"|(?P<date_time>.*_at\Z|.*(?:timestamp|datetime))"
+    r"|(?P<date_object>.*date)",
+    re.DOTALL,
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _infer_provider(col_name: str) -> str | None:
+    m = _PROVIDER_RE.match(col_name.lower())
+    return m.lastgroup if m else None
+
+
+def _dumps_schema(schema_json: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(
+            schema_json, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        ).decode()
+    return json.dumps(schema_json, indent=2, sort_keys=True)
+
+
+def _has_int_pk(table: Table) -> bool:
+    # Int PKs are always generated as 1..n, so they never need to be shipped.
+    # FKs to them are drawn from 1..n too, which relies on every table having
+    # the same row count (rows_per_table) as its parents.
+    return table.primary_keys()[0].type == "int"
+
 
-from app.synth_data.models import Schema
+def _column_expr(
+    col: Column, tables_by_name: dict[str, Table], provider_locals: dict[str, str]
+) -> str:
+    """Returns the expression that builds one column's values in the script.
 
+    Faker providers are referenced through locals bound once per table; any
+    provider used here is registered in `provider_locals`.
+    """
+    if col.primary_key:
+        if col.type == "int":
+            return "np.arange(1, n + 1)"
+        # default to uuid string for non-int pk
+        return "[str(uuid.uuid4()) for _ in range(n)]"
+
+    if col.foreign_key is not None:
+        parent_table = col.foreign_key.ref_table
+        if _has_int_pk(tables_by_name[parent_table]):
+            return "rng.integers(1, n + 1, n)"
+        # Parents are generated first, so their PKs are always available here.
+        return f"rng.choice(pk_values[{parent_table!r}], size=n)"
 
-def _toposort_tables(schema: Schema) -> list[str]:
+    # Prefer explicit faker hint.
+    provider = col.faker or _infer_provider(col.name)
+    provider_fn = "None"
+    if provider:
+        # Hints are free text, so locals are named by index, not by provider.
+        provider_fn = provider_locals.setdefault(
+            provider, f"fake_p{len(provider_locals)}"
+        )
+    if col.unique:
+        if provider is None and col.type == "int":
+            # Sample without replacement instead of rejecting collisions.
+            expr = "rng.choice(n * 10, size=n, replace=False) + 1"
+        else:
+            expr = (
+                f"_unique_column(fake, n, key={col.name!r}, typ={col.type!r}, "
+                f"provider_fn={provider_fn})"
+            )
+    elif provider is None and col.type == "int":
+        expr = "rng.integers(1, 10_000_001, n)"
+    elif provider is None and col.type == "float":
+        expr = "np.round(rng.random(n) * 10_000, 2)"
+    elif provider is None and col.type == "bool":
+        expr = "rng.integers(0, 2, n, dtype=bool)"
+    else:
+        expr = f"_scalar_column(fake, n, typ={col.type!r}, provider_fn={provider_fn})"
+
+    if col.nullable:
+        expr = f"_with_nulls({expr}, rng)"
+    return expr
+
+
+def _table_function(
+    table: Table,
+    tables_by_name: dict[str, Table],
+    func_name: str,
+    rows_per_table: int,
+) -> str:
+    """Emits a generator function specialized to a single table."""
+    pk = table.primary_keys()[0]
+    provider_locals: dict[str, str] = {}
+    column_lines = [
+        f"    columns[{c.name!r}] = {_column_expr(c, tables_by_name, provider_locals)}"
+        for c in table.columns
+    ]
+    lines = [
+        f"# Table {table.name!r}",
+        f"def {func_name}(out_dir: str, pk_values: dict[str, np.ndarray]) -> np.ndarray:",
+        f"    fake, rng = _table_rngs({table.name!r})",
+        f"    n = {rows_per_table}",
+    ]
+    # Resolve each provider once instead of going through Faker.__getattr__.
+    lines += [
+        f"    {local} = getattr(fake, {provider!r}, None)"
+        for provider, local in provider_locals.items()
+    ]
+    lines += ["    columns: dict[str, ColumnValues] = {}", *column_lines]
+    lines += [
+        f"    _write_csv(os.path.join(out_dir, {table.name + '.csv'!r}), columns)",
+        # Keep PKs as an array so every FK draw on them skips a list conversion.
+        f"    return np.asarray(columns[{pk.name!r}])",
+    ]
+    return "\n".join(lines)
+
+
+def _table_function_names(order: list[str]) -> dict[str, str]:
+    # Identifiers are not derived from table names: names that differ can
+    # collide after NFKC normalization, and some \w characters are not valid
+    # in identifiers at all.
+    return {table_name: f"_gen_{i}" for i, table_name in enumerate(order)}
+
+
+def _toposort_tables(schema: Schema) -> list[list[str]]:
+    """Groups tables into FK dependency levels, parents before children.
+
+    Tables within a level do not depend on each other and can be generated
+    concurrently; each level only depends on the levels before it.
+    """
     tables = [t.name for t in schema.tables]
+    edges = list(schema.dependency_edges())
+    # Without FKs every table is already a source; declaration order is valid.
+    if not edges:
+        return [tables]
+
     indeg: dict[str, int] = {t: 0 for t in tables}
     out: dict[str, set[str]] = {t: set() for t in tables}
+    seen_edges: set[tuple[str, str]] = set()
 
-    for child, parent in schema.dependency_edges():
+    for child, parent in edges:
         if child == parent:
             raise ValueError(f"Self-referential FK detected on table '{child}'.")
         if parent not in indeg or child not in indeg:
             continue
-        if parent not in out[parent]:
-            out[parent].add(child)
-            indeg[child] += 1
-
-    q: deque[str] = deque([t for t in tables if indeg[t] == 0])
-    ordered: list[str] = []
-    while q:
-        t = q.popleft()
-        ordered.append(t)
-        for child in out[t]:
-            indeg[child] -= 1
-            if indeg[child] == 0:
-                q.append(child)
-
-    if len(ordered) != len(tables):
-        remaining = [t for t in tables if t not in ordered]
+        # Several FKs between the same pair of tables form a single dependency.
+        edge = (child, parent)
+        if edge in seen_edges:
+            continue
+        seen_edges.add(edge)
+        out[parent].add(child)
+        indeg[child] += 1
+
+    position = {t: i for i, t in enumerate(tables)}
+    levels: list[list[str]] = []
+    level = [t for t in tables if indeg[t] == 0]
+    placed = 0
+    while level:
+        levels.append(level)
+        placed += len(level)
+        next_level: list[str] = []
+        for t in level:
+            for child in out[t]:
+                indeg[child] -= 1
+                if indeg[child] == 0:
+                    next_level.append(child)
+        # Keep declaration order within a level so output is deterministic.
+        level = sorted(next_level, key=position.__getitem__)
+
+    if placed != len(tables):
+        ordered_set = {t for lvl in levels for t in lvl}
+        remaining = [t for t in tables if t not in ordered_set]
         raise ValueError(
             "Cyclic FK dependencies detected; cannot safely order tables: "
             + ", ".join(remaining)
         )
-    return ordered
+    return levels
 
 
 def generate_faker_python_script(
@@ -48,18 +209,46 @@ def generate_faker_python_script(
     """Generate an executable Python script (as text) that writes CSV data.
 
     The generated script:
-    - Generates tables in FK dependency order (parents first)
+    - Generates tables in FK dependency order (parents first), running the
+      independent tables of each dependency level in parallel processes
+    - Emits one function per table, specialized to that table's columns
+    - Builds each table column by column, using NumPy for numeric columns
     - Ensures FK values always reference existing parent PKs
     - Writes one CSV per table to ./out/<table>.csv
     """
     if rows_per_table <= 0:
         raise ValueError("rows_per_table must be > 0")
 
-    order = _toposort_tables(schema)
-    schema_json = schema.model_dump(mode="json")
-    schema_json_str = json.dumps(schema_json, indent=2, sort_keys=True)
+    if any(len(t.primary_keys()) != 1 for t in schema.tables):
+        raise ValueError("Only single-column primary keys are supported.")
 
-    # Note: we embed schema_json_str into the script for traceability.
+    tables_by_name = {t.name: t for t in schema.tables}
+    levels = _toposort_tables(schema)
+    order = [name for level in levels for name in level]
+    func_names = _table_function_names(order)
+    table_functions = "\n\n\n".join(
+        _table_function(
+            tables_by_name[name], tables_by_name, func_names[name], rows_per_table
+        )
+        for name in order
+    )
+    table_funcs = "\n".join(f"    {name!r}: {func_names[name]}," for name in order)
+    parents: dict[str, set[str]] = {name: set() for name in order}
+    for child, parent in schema.dependency_edges():
+        if not _has_int_pk(tables_by_name[parent]):
+            parents[child].add(parent)
+    table_parents = {name: sorted(parents[name]) for name in order}
+    # Unset/default fields add nothing to the traceability copy.
+    schema_json = schema.model_dump(
+        mode="json", exclude_none=True, exclude_defaults=True
+    )
+    schema_json_str = _dumps_schema(schema_json)
+    schema_comment = "\n".join(
+        f"# {line}".rstrip() for line in f"SCHEMA = {schema_json_str}".splitlines()
+    )
+
+    # Note: the schema is embedded as a comment for traceability only; each
+    # table's generation is specialized into its own function below.
     return f'''\
 #!/usr/bin/env python3
 """
@@ -72,166 +261,169 @@ Seed: {seed}
 
 from __future__ import annotations
 
+import contextlib
 import csv
+import io
 import os
 import random
 import uuid
+import zlib
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
 
+import numpy as np
 from faker import Faker
 
 
-SCHEMA = {schema_json_str}
+{schema_comment}
 TABLE_ORDER = {order!r}
+TABLE_LEVELS = {levels!r}
+TABLE_PARENTS = {table_parents!r}
+SEED = {seed}
+
+# Columns are NumPy arrays for vectorized draws and lists for everything else.
+ColumnValues = Sequence[object] | np.ndarray
 
 
 def _ensure_out_dir(out_dir: str) -> None:
     os.makedirs(out_dir, exist_ok=True)
 
 
-def _infer_provider(col_name: str) -> str | None:
-    n = col_name.lower()
-    if n in ("id",) or n.endswith("_id"):
-        return "uuid4"
-    if "email" in n:
-        return "email"
-    if n in ("first_name", "firstname"):
-        return "first_name"
-    if n in ("last_name", "lastname", "surname"):
-        return "last_name"
-    if "name" in n:
-        return "name"
-    if "company" in n or "employer" in n:
-        return "company"
-    if "phone" in n or "mobile" in n:
-        return "phone_number"
-    if "address" in n:
-        return "street_address"
-    if "city" in n:
-        return "city"
-    if "state" in n or "province" in n:
-        return "state"
-    if "country" in n:
-        return "country"
-    if "zip" in n or "postal" in n:
-        return "postcode"
-    if n.endswith("_at") or "timestamp" in n or "datetime" in n:
-        return "date_time"
-    if "date" in n:
-        return "date_object"
-    return None
-
-
-def _generate_scalar(fake: Faker, col: dict, *, unique_tracker: dict[str, set]) -> object:
-    # Prefer explicit faker hint.
-    provider = col.get("faker") or _infer_provider(col["name"])
-    typ = col.get("type", "str")
-    key = col["name"]
-
-    def gen() -> object:
-        if provider and hasattr(fake, provider):
-            v = getattr(fake, provider)()
-            # Normalize uuid type to string for CSV.
-            if isinstance(v, uuid.UUID):
-                return str(v)
-            if isinstance(v, (datetime, date)):
-                return v.isoformat()
-            return v
-
-        if typ == "int":
-            return random.randint(1, 10_000_000)
-        if typ == "float":
-            return round(random.random() * 10_000, 2)
-        if typ == "bool":
-            return bool(random.getrandbits(1))
-        if typ == "date":
-            return fake.date_object().isoformat()
-        if typ == "datetime":
-            return fake.date_time().isoformat()
-        # default: str
-        return fake.word()
-
-    if col.get("unique"):
-        seen = unique_tracker.setdefault(key, set())
-        for _ in range(1000):
-            v = gen()
-            if v not in seen:
-                seen.add(v)
-                return v
-        raise RuntimeError(f"Failed to generate unique value for column: {{key}}")
-
-    return gen()
-
-
-def _pk_generator(col: dict, row_idx: int) -> object:
-    typ = col.get("type", "int")
+def _table_rngs(table_name: str) -> tuple[Faker, np.random.Generator]:
+    # Seed per table (crc32 is stable across processes, unlike hash()) so the
+    # output does not depend on which worker generates which table.
+    table_seed = (SEED + zlib.crc32(table_name.encode("utf-8"))) % 2**32
+    fake = Faker()
+    fake.seed_instance(table_seed)
+    random.seed(table_seed)
+    return fake, np.random.default_rng(table_seed)
+
+
+def _normalize(v: object) -> object:
+    # Normalize uuid/date types to strings for CSV.
+    if isinstance(v, uuid.UUID):
+        return str(v)
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    return v
+
+
+def _value_factory(
+    fake: Faker, typ: str, provider_fn: Callable[[], object] | None
+) -> Callable[[], object]:
+    if provider_fn is not None:
+        return lambda: _normalize(provider_fn())
     if typ == "int":
-        return row_idx + 1
-    # default to uuid string for non-int pk
-    return str(uuid.uuid4())
+        return lambda: random.randint(1, 10_000_000)
+    if typ == "float":
+        return lambda: round(random.random() * 10_000, 2)
+    if typ == "bool":
+        return lambda: bool(random.getrandbits(1))
+    if typ == "date":
+        date_object = fake.date_object
+        return lambda: date_object().isoformat()
+    if typ == "datetime":
+        date_time = fake.date_time
+        return lambda: date_time().isoformat()
+    # default: str
+    return fake.word
+
+
+def _scalar_column(
+    fake: Faker,
+    n: int,
+    *,
+    typ: str,
+    provider_fn: Callable[[], object] | None,
+) -> list[object]:
+    gen = _value_factory(fake, typ, provider_fn)
+    return [gen() for _ in range(n)]
 
 
-def generate(out_dir: str = "out") -> None:
-    fake = Faker()
-    Faker.seed({seed})
-    random.seed({seed})
-    _ensure_out_dir(out_dir)
+def _unique_column(
+    fake: Faker,
+    n: int,
+    *,
+    key: str,
+    typ: str,
+    provider_fn: Callable[[], object] | None,
+) -> list[object]:
+    gen = _value_factory(fake, typ, provider_fn)
+    # Draw the whole column, dedupe, then top up only the shortfall.
+    pool: dict[object, None] = {{}}
+    stalls = 0
+    while len(pool) < n:
+        before = len(pool)
+        for _ in range(n - before):
+            pool.setdefault(gen())
+        if len(pool) == before:
+            stalls += 1
+            if stalls >= 10:
+                raise RuntimeError(f"Failed to generate unique value for column: {{key}}")
+    return list(pool)
 
-    # Track generated PKs for FK assignment.
-    pk_values: dict[str, list[object]] = {{}}
 
-    # Track per-table unique values.
-    unique_tracker_by_table: dict[str, dict[str, set]] = {{}}
+def _with_nulls(values: ColumnValues, rng: np.random.Generator) -> list[object]:
+    # One vectorized draw decides which ~5% of the cells are left empty. The
+    # values are not converted to an array: tuple-valued providers would turn
+    # into a 2-D array and change how the cells are written.
+    mask = rng.random(len(values)) < 0.05
+    return ["" if m else v for v, m in zip(values, mask)]
 
-    tables_by_name = {{t["name"]: t for t in SCHEMA["tables"]}}
 
-    for table_name in TABLE_ORDER:
-        table = tables_by_name[table_name]
-        cols = table["columns"]
+def _write_csv(out_path: str, columns: dict[str, ColumnValues]) -> None:
+    # Rows are only assembled here, from the finished columns. A 1 MiB binary
+    # buffer under the text layer batches both encoding and write() syscalls.
+    with (
+        open(out_path, "wb", buffering=1 << 20) as fb,
+        io.TextIOWrapper(fb, encoding="utf-8", newline="", write_through=False) as f,
+    ):
+        writer = csv.writer(f)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*columns.values()))
+
+
+{table_functions}
 
-        pk_cols = [c for c in cols if c.get("primary_key")]
-        if len(pk_cols) != 1:
-            raise RuntimeError(
-                f"Only single-column primary keys are supported (table={{table_name}})."
-            )
-        pk_col = pk_cols[0]
-
-        out_path = os.path.join(out_dir, f"{{table_name}}.csv")
-        unique_tracker = unique_tracker_by_table.setdefault(table_name, {{}})
-
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[c["name"] for c in cols])
-            writer.writeheader()
-
-            pk_values.setdefault(table_name, [])
-
-            for i in range({rows_per_table}):
-                row: dict[str, object] = {{}}
-                for c in cols:
-                    cname = c["name"]
-                    if c.get("primary_key"):
-                        row[cname] = _pk_generator(c, i)
-                        continue
-
-                    fk = c.get("foreign_key")
-                    if fk is not None:
-                        parent_table = fk["ref_table"]
-                        candidates = pk_values.get(parent_table, [])
-                        if not candidates:
-                            raise RuntimeError(
-                                f"FK {{table_name}}.{{cname}} references "
-                                f"{{parent_table}} but no parent rows exist."
-                            )
-                        row[cname] = random.choice(candidates)
-                        continue
-
-                    if c.get("nullable") and random.random() < 0.05:
-                        row[cname] = ""
-                    else:
-                        row[cname] = _generate_scalar(fake, c, unique_tracker=unique_tracker)
-
-                writer.writerow(row)
-                pk_values[table_name].append(row[pk_col["name"]])
+
+TABLE_FUNCS: dict[str, Callable[[str, dict[str, np.ndarray]], np.ndarray]] = {{
+{table_funcs}
+}}
+
+
+def _run_table(table_name: str, out_dir: str, parent_pks: dict[str, np.ndarray]) -> np.ndarray:
+    return TABLE_FUNCS[table_name](out_dir, parent_pks)
+
+
+def generate(out_dir: str = "out") -> None:
+    _ensure_out_dir(out_dir)
+
+    # Track generated PKs for FK assignment.
+    pk_values: dict[str, np.ndarray] = {{}}
+
+    with contextlib.ExitStack() as stack:
+        # Worker processes are only started when some level has tables that
+        # can run side by side, and never more than the widest level or the
+        # CPU count allows.
+        max_width = max(len(level) for level in TABLE_LEVELS)
+        workers = min(max_width, os.cpu_count() or 1)
+        executor: ProcessPoolExecutor | None = None
+        if workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+        for level in TABLE_LEVELS:
+            # Only ship each table the parent PKs it samples FKs from.
+            parent_pks = [{{p: pk_values[p] for p in TABLE_PARENTS[t]}} for t in level]
+            if executor is None or len(level) == 1:
+                results = [
+                    _run_table(t, out_dir, pks) for t, pks in zip(level, parent_pks)
+                ]
+            else:
+                results = list(
+                    executor.map(_run_table, level, [out_dir] * len(level), parent_pks)
+                )
+            pk_values.update(zip(level, results))
 
     print(f"Wrote CSV files to: {{os.path.abspath(out_dir)}}")
 
@@ -239,5 +431,3 @@ def generate(out_dir: str = "out") -> None:
 if __name__ == "__main__":
     generate()
 '''
-
-
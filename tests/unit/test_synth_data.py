@@ -1,13 +1,52 @@
 # mypy: disable-error-code="no-untyped-call"
 
+import csv
 import json
+import os
+import runpy
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
-from app.synth_data.codegen import generate_faker_python_script
+from app.synth_data.codegen import (
+    _infer_provider,
+    _toposort_tables,
+    generate_faker_python_script,
+)
 from app.synth_data.models import Schema
 
 
+def _fk(ref_table: str, ref_column: str = "id") -> dict:
+    return {"ref_table": ref_table, "ref_column": ref_column}
+
+
+def _run_generated_script(
+    schema: Schema, tmp_path: Path, *, rows_per_table: int = 20, seed: int = 1
+) -> dict[str, list[dict[str, str]]]:
+    """Runs the generated script in `tmp_path` and reads back every CSV."""
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    script_path = tmp_path / "generate.py"
+    script_path.write_text(
+        generate_faker_python_script(
+            schema=schema, rows_per_table=rows_per_table, seed=seed
+        ),
+        encoding="utf-8",
+    )
+    subprocess.run(
+        [sys.executable, str(script_path)],
+        cwd=tmp_path,
+        check=True,
+        capture_output=True,
+    )
+    tables = {}
+    for csv_path in sorted((tmp_path / "out").glob("*.csv")):
+        with csv_path.open(newline="", encoding="utf-8") as f:
+            tables[csv_path.stem] = list(csv.DictReader(f))
+    return tables
+
+
 def test_schema_validation_fk_references_existing() -> None:
     schema = Schema.model_validate(
         {
@@ -97,11 +136,336 @@ def test_codegen_embeds_schema_and_table_order() -> None:
     assert "TABLE_ORDER" in script
     assert '"name": "test"' in script
 
-    # Ensure the embedded schema is valid JSON inside the script.
-    start = script.index("SCHEMA = ") + len("SCHEMA = ")
+    # Ensure the schema embedded as a comment is valid JSON.
+    start = script.index("# SCHEMA = ")
     end = script.index("\nTABLE_ORDER")
-    embedded = script[start:end].strip()
+    embedded = "\n".join(
+        line.removeprefix("#") for line in script[start:end].splitlines()
+    ).replace("SCHEMA = ", "", 1)
     parsed = json.loads(embedded)
     assert parsed["name"] == "test"
 
+    # The generated script itself must be valid Python.
+    compile(script, "generated.py", "exec")
+
+
+def test_codegen_orders_tables_with_multiple_fks_to_same_parent() -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": "transfers",
+                    "columns": [
+                        {"name": "transfer_id", "type": "int", "primary_key": True},
+                        {
+                            "name": "from_account_id",
+                            "type": "int",
+                            "foreign_key": _fk("accounts", "account_id"),
+                        },
+                        {
+                            "name": "to_account_id",
+                            "type": "int",
+                            "foreign_key": _fk("accounts", "account_id"),
+                        },
+                    ],
+                },
+                {
+                    "name": "accounts",
+                    "columns": [
+                        {"name": "account_id", "type": "int", "primary_key": True}
+                    ],
+                },
+            ],
+        }
+    )
+
+    script = generate_faker_python_script(schema=schema, rows_per_table=3, seed=1)
+    assert "TABLE_ORDER = ['accounts', 'transfers']" in script
+
+
+@pytest.mark.parametrize(
+    ("col_name", "expected"),
+    [
+        ("id", "uuid4"),
+        ("customer_id", "uuid4"),
+        ("work_email", "email"),
+        ("FirstName", "first_name"),
+        ("surname", "last_name"),
+        ("first_name_alias", "name"),
+        ("employer", "company"),
+        ("mobile", "phone_number"),
+        ("shipping_address", "street_address"),
+        ("created_at", "date_time"),
+        ("birth_date", "date_object"),
+        ("amount", None),
+    ],
+)
+def test_infer_provider_follows_name_heuristics(
+    col_name: str, expected: str | None
+) -> None:
+    assert _infer_provider(col_name) == expected
+
+
+def test_toposort_groups_independent_tables_into_levels() -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": "order_items",
+                    "columns": [
+                        {"name": "id", "type": "int", "primary_key": True},
+                        {
+                            "name": "order_id",
+                            "type": "int",
+                            "foreign_key": _fk("orders"),
+                        },
+                        {
+                            "name": "sku_id",
+                            "type": "int",
+                            "foreign_key": _fk("products"),
+                        },
+                    ],
+                },
+                {
+                    "name": "orders",
+                    "columns": [
+                        {"name": "id", "type": "int", "primary_key": True},
+                        {"name": "user_id", "type": "int", "foreign_key": _fk("users")},
+                    ],
+                },
+                {
+                    "name": "users",
+                    "columns": [{"name": "id", "type": "int", "primary_key": True}],
+                },
+                {
+                    "name": "products",
+                    "columns": [{"name": "id", "type": "int", "primary_key": True}],
+                },
+            ],
+        }
+    )
+
+    assert _toposort_tables(schema) == [
+        ["users", "products"],
+        ["orders"],
+        ["order_items"],
+    ]
+
+
+def test_toposort_reports_tables_on_fk_cycle() -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": "users",
+                    "columns": [{"name": "id", "type": "int", "primary_key": True}],
+                },
+                {
+                    "name": "teams",
+                    "columns": [
+                        {"name": "id", "type": "int", "primary_key": True},
+                        {
+                            "name": "lead_id",
+                            "type": "int",
+                            "foreign_key": _fk("members"),
+                        },
+                    ],
+                },
+                {
+                    "name": "members",
+                    "columns": [
+                        {"name": "id", "type": "int", "primary_key": True},
+                        {"name": "team_id", "type": "int", "foreign_key": _fk("teams")},
+                        {"name": "user_id", "type": "int", "foreign_key": _fk("users")},
+                    ],
+                },
+            ],
+        }
+    )
+
+    with pytest.raises(
+        ValueError, match=r"cannot safely order tables: teams, members$"
+    ):
+        _toposort_tables(schema)
+
+
+def test_generated_nulls_keep_tuple_valued_providers_intact(tmp_path: Path) -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": "places",
+                    "columns": [
+                        {"name": "place_id", "type": "int", "primary_key": True},
+                        {
+                            "name": "coords",
+                            "type": "str",
+                            "nullable": True,
+                            "faker": "latlng",
+                        },
+                    ],
+                }
+            ],
+        }
+    )
+
+    tables = _run_generated_script(schema, tmp_path, rows_per_table=50)
+
+    coords = [row["coords"] for row in tables["places"]]
+    assert len(coords) == 50
+    assert all(c == "" or c.startswith("(Decimal(") for c in coords)
+
+
+def test_generated_script_runs_and_is_reproducible(tmp_path: Path) -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "shop",
+            "tables": [
+                {
+                    "name": "orders",
+                    "columns": [
+                        {"name": "order_id", "type": "int", "primary_key": True},
+                        {
+                            "name": "user_id",
+                            "type": "int",
+                            "foreign_key": _fk("users", "user_id"),
+                        },
+                        {"name": "ref_no", "type": "int", "unique": True},
+                        {"name": "qty", "type": "int", "nullable": True},
+                    ],
+                },
+                {
+                    "name": "reviews",
+                    "columns": [
+                        {"name": "review_id", "type": "int", "primary_key": True},
+                        {
+                            "name": "product_code",
+                            "type": "str",
+                            "foreign_key": _fk("products", "code"),
+                        },
+                        {
+                            "name": "user_id",
+                            "type": "int",
+                            "foreign_key": _fk("users", "user_id"),
+                        },
+                    ],
+                },
+                {
+                    "name": "users",
+                    "columns": [
+                        {"name": "user_id", "type": "int", "primary_key": True},
+                        {"name": "email", "type": "str", "unique": True},
+                        {"name": "nickname", "type": "str", "nullable": True},
+                    ],
+                },
+                {
+                    "name": "products",
+                    "columns": [
+                        {"name": "code", "type": "str", "primary_key": True},
+                        {"name": "price", "type": "float"},
+                    ],
+                },
+            ],
+        }
+    )
+
+    first = _run_generated_script(schema, tmp_path / "first", rows_per_table=200)
+    _run_generated_script(schema, tmp_path / "second", rows_per_table=200)
+
+    assert sorted(first) == ["orders", "products", "reviews", "users"]
+    assert all(len(rows) == 200 for rows in first.values())
+
+    user_ids = {row["user_id"] for row in first["users"]}
+    product_codes = {row["code"] for row in first["products"]}
+    assert {row["user_id"] for row in first["orders"]} <= user_ids
+    assert {row["user_id"] for row in first["reviews"]} <= user_ids
+    assert {row["product_code"] for row in first["reviews"]} <= product_codes
+
+    for table, column in [("users", "email"), ("orders", "ref_no")]:
+        values = [row[column] for row in first[table]]
+        assert len(set(values)) == len(values)
+
+    # uuid4 PKs are not seeded, so only tables that neither use nor reference
+    # them are expected to be identical across runs.
+    for table in ("users", "orders"):
+        assert (tmp_path / "first" / "out" / f"{table}.csv").read_bytes() == (
+            tmp_path / "second" / "out" / f"{table}.csv"
+        ).read_bytes()
+
+
+def test_generated_script_handles_non_identifier_table_names(tmp_path: Path) -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": name,
+                    "columns": [{"name": "id", "type": "int", "primary_key": True}],
+                }
+                for name in ["file", "ﬁle", "m²"]
+            ],
+        }
+    )
+
+    tables = _run_generated_script(schema, tmp_path, rows_per_table=5)
+
+    assert sorted(tables) == sorted(["file", "ﬁle", "m²"])
+    assert all(len(rows) == 5 for rows in tables.values())
+
+
+def test_generated_script_runs_wide_levels_inline_on_one_cpu(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": f"t{i}",
+                    "columns": [{"name": "id", "type": "int", "primary_key": True}],
+                }
+                for i in range(8)
+            ],
+        }
+    )
+    script_path = tmp_path / "generate.py"
+    script_path.write_text(
+        generate_faker_python_script(schema=schema, rows_per_table=3, seed=1),
+        encoding="utf-8",
+    )
+
+    # With a single CPU no pool is started and every table runs in-process.
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    monkeypatch.chdir(tmp_path)
+    runpy.run_path(str(script_path), run_name="__main__")
+
+    assert sorted(p.name for p in (tmp_path / "out").glob("*.csv")) == sorted(
+        f"t{i}.csv" for i in range(8)
+    )
+
+
+def test_generated_script_accepts_free_text_faker_hints(tmp_path: Path) -> None:
+    schema = Schema.model_validate(
+        {
+            "name": "test",
+            "tables": [
+                {
+                    "name": "items",
+                    "columns": [
+                        {"name": "item_id", "type": "int", "primary_key": True},
+                        {"name": "label", "type": "str", "faker": "²"},
+                        {"name": "city", "type": "str", "faker": "city"},
+                    ],
+                }
+            ],
+        }
+    )
+
+    tables = _run_generated_script(schema, tmp_path, rows_per_table=5)
 
+    assert len(tables["items"]) == 5
+    assert all(row["label"] and row["city"] for row in tables["items"])